@@ -0,0 +1,97 @@
+import io
+from PIL import Image
+
+FORMAT_ALIASES = {
+    "JPG": "JPEG"
+}
+
+FORMAT_EXTENSIONS = {
+    "PNG": ".png",
+    "JPEG": ".jpg",
+    "WEBP": ".webp"
+}
+
+def normalize_format(image_format):
+    """Return the PIL format name for a codec name such as 'jpg' or 'webp'"""
+    image_format = image_format.upper()
+    return FORMAT_ALIASES.get(image_format, image_format)
+
+def encode_image(image, image_format, quality=None):
+    """Encode a PIL image, converting the mode when the codec requires it"""
+    image_format = normalize_format(image_format)
+    if image_format == "JPEG" and image.mode not in ("RGB", "L"):
+        image = image.convert("RGB")
+
+    options = {}
+    if quality is not None and image_format in ("JPEG", "WEBP"):
+        options['quality'] = quality
+
+    img_byte_arr = io.BytesIO()
+    image.save(img_byte_arr, format=image_format, **options)
+    return img_byte_arr.getvalue()
+
+
+class ImageArtifact:
+    """A generated image that keeps its original encoded bytes.
+
+    The bytes are only decoded when the pixels are needed, and an image that
+    was created from pixels is only encoded when the bytes are needed, so
+    passing an artifact along never re-encodes it.
+
+    Artifacts are read-only and may be shared, e.g. the memoized placeholders
+    in utils. Never modify the image returned by .image in place; copy it first.
+    """
+
+    def __init__(self, data=None, image=None, image_format=None):
+        if data is None and image is None:
+            raise ValueError("ImageArtifact needs encoded data or an image")
+        self._data = data
+        self._image = image
+        self._format = normalize_format(image_format) if image_format else None
+
+    @classmethod
+    def from_image(cls, image, image_format="PNG"):
+        """Wrap a PIL image, deferring encoding until the bytes are needed"""
+        return cls(image=image, image_format=image_format)
+
+    @property
+    def data(self):
+        """The encoded image bytes"""
+        if self._data is None:
+            self._data = encode_image(self._image, self.format)
+        return self._data
+
+    @property
+    def image(self):
+        """The decoded PIL image, shared with other users of the artifact and read-only"""
+        if self._image is None:
+            self._image = Image.open(io.BytesIO(self._data))
+        return self._image
+
+    @property
+    def format(self):
+        """The format of the encoded bytes, read from the header when not given"""
+        if self._format is None:
+            self._format = self.image.format or "PNG"
+        return self._format
+
+    @property
+    def size(self):
+        return self.image.size
+
+    def encode(self, image_format=None, quality=None):
+        """Return the image encoded as the given format.
+
+        The original bytes are returned unchanged when they already have that format.
+        """
+        image_format = normalize_format(image_format) if image_format else self.format
+        if image_format == self.format:
+            return self.data
+        return encode_image(self.image, image_format, quality)
+
+    def thumbnail(self, size, image_format=None, quality=None):
+        """Return a new artifact scaled down to fit within size"""
+        image_format = normalize_format(image_format) if image_format else self.format
+        thumb = self.image.copy()
+        thumb.thumbnail(size)
+        return ImageArtifact(encode_image(thumb, image_format, quality), thumb, image_format)
@@ -0,0 +1,189 @@
+import random
+import threading
+import time
+import zlib
+from PIL import Image, ImageDraw
+from artifacts import ImageArtifact
+from config import (
+    TEXT_BACKEND,
+    IMAGE_BACKEND,
+    GEMINI_MODEL_NAME,
+    VERTEX_AI_LOCATION,
+    VERTEX_AI_IMAGE_MODEL,
+    API_KEY,
+    PROJECT_ID,
+    LOCAL_BACKEND_LATENCY,
+    LOCAL_BACKEND_JITTER,
+    LOCAL_BACKEND_ERROR_RATE,
+    LOCAL_BACKEND_TEXT_WORDS,
+    LOCAL_BACKEND_IMAGE_SIZE,
+    LOCAL_BACKEND_SEED
+)
+
+class TextBackend:
+    """Base class for text generation backends"""
+    name = "text"
+
+    def generate_text(self, prompt):
+        """Return the generated text for the prompt"""
+        raise NotImplementedError
+
+
+class ImageBackend:
+    """Base class for image generation backends"""
+    name = "image"
+
+    def generate_image(self, prompt):
+        """Return an ImageArtifact for the prompt, or None if nothing was produced"""
+        raise NotImplementedError
+
+
+class GeminiTextBackend(TextBackend):
+    """Text generation through the Gemini API"""
+
+    def __init__(self, api_key=API_KEY, model_name=GEMINI_MODEL_NAME):
+        import google.generativeai as genai
+
+        genai.configure(api_key=api_key)
+        self.model = genai.GenerativeModel(model_name=model_name)
+        self.name = f"gemini:{model_name}"
+
+    def generate_text(self, prompt):
+        response = self.model.generate_content(prompt)
+        return response.text
+
+
+class VertexImageBackend(ImageBackend):
+    """Image generation through Vertex AI Imagen"""
+
+    def __init__(self, project_id=PROJECT_ID, location=VERTEX_AI_LOCATION, model_name=VERTEX_AI_IMAGE_MODEL):
+        import vertexai
+        from vertexai.preview.vision_models import ImageGenerationModel
+
+        vertexai.init(project=project_id, location=location)
+        self.model = ImageGenerationModel.from_pretrained(model_name)
+        self.name = f"vertex:{model_name}"
+
+    def generate_image(self, prompt):
+        response = self.model.generate_images(
+            prompt=prompt,
+            number_of_images=1
+        )
+
+        if hasattr(response, 'images') and response.images:
+            img = response.images[0]
+
+            # Prefer the encoded bytes returned by the API over the decoded image
+            for attribute in ('_image_bytes', '_loaded_bytes', 'bytes'):
+                data = getattr(img, attribute, None)
+                if data:
+                    return ImageArtifact(data)
+
+            if getattr(img, '_pil_image', None) is not None:
+                return ImageArtifact.from_image(img._pil_image)
+
+        return None
+
+
+class LocalBackend:
+    """Shared latency and failure simulation for the local stand-in backends.
+
+    Latency, jitter and errors are drawn from a seeded generator, while the
+    generated content only depends on the prompt, so repeated runs are reproducible.
+    """
+
+    def __init__(self, latency=LOCAL_BACKEND_LATENCY, jitter=LOCAL_BACKEND_JITTER,
+                 error_rate=LOCAL_BACKEND_ERROR_RATE, seed=LOCAL_BACKEND_SEED):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _simulate_call(self):
+        """Sleep for the configured latency and raise a simulated error if one is drawn"""
+        with self._lock:
+            delay = self.latency + self._rng.uniform(-self.jitter, self.jitter)
+            failed = self._rng.random() < self.error_rate
+        time.sleep(max(0.0, delay))
+        if failed:
+            raise Exception(f"Simulated {self.name} backend error")
+
+    @staticmethod
+    def _prompt_rng(prompt):
+        """Return a generator seeded from the prompt so content is deterministic"""
+        return random.Random(zlib.crc32(prompt.encode("utf-8")))
+
+
+class LocalTextBackend(LocalBackend, TextBackend):
+    """Offline stand-in for the text backend"""
+    name = "local-text"
+
+    WORDS = [
+        "the", "night", "city", "we", "never", "again", "listen", "truth", "run",
+        "door", "light", "promise", "lost", "find", "them", "now", "tomorrow",
+        "remember", "plan", "trust", "me", "you", "here", "gone", "every", "time"
+    ]
+
+    def __init__(self, words=LOCAL_BACKEND_TEXT_WORDS, **kwargs):
+        super().__init__(**kwargs)
+        self.words = words
+
+    def generate_text(self, prompt):
+        self._simulate_call()
+        rng = self._prompt_rng(prompt)
+
+        lines = []
+        remaining = self.words
+        speaker = 0
+        while remaining > 0:
+            count = min(remaining, rng.randint(6, 18))
+            line = " ".join(rng.choice(self.WORDS) for _ in range(count))
+            lines.append(f"**Character {speaker % 2 + 1}**: {line.capitalize()}.")
+            remaining -= count
+            speaker += 1
+        return "\n".join(lines)
+
+
+class LocalImageBackend(LocalBackend, ImageBackend):
+    """Offline stand-in for the image backend"""
+    name = "local-image"
+
+    def __init__(self, size=LOCAL_BACKEND_IMAGE_SIZE, **kwargs):
+        super().__init__(**kwargs)
+        self.size = tuple(size)
+
+    def generate_image(self, prompt):
+        self._simulate_call()
+        rng = self._prompt_rng(prompt)
+
+        color = (rng.randint(0, 160), rng.randint(0, 160), rng.randint(0, 160))
+        img = Image.new('RGB', self.size, color=color)
+        draw = ImageDraw.Draw(img)
+        draw.text((10, 10), "Local Backend Image", fill=(255, 255, 255))
+        draw.text((10, 50), f"Prompt: {prompt[:150]}", fill=(255, 255, 255))
+
+        return ImageArtifact.from_image(img)
+
+
+TEXT_BACKENDS = {
+    "gemini": GeminiTextBackend,
+    "local": LocalTextBackend
+}
+
+IMAGE_BACKENDS = {
+    "vertex": VertexImageBackend,
+    "local": LocalImageBackend
+}
+
+def create_text_backend(name=TEXT_BACKEND):
+    """Create the text backend registered under the given name"""
+    if name not in TEXT_BACKENDS:
+        raise ValueError(f"Unknown text backend: {name}")
+    return TEXT_BACKENDS[name]()
+
+def create_image_backend(name=IMAGE_BACKEND):
+    """Create the image backend registered under the given name"""
+    if name not in IMAGE_BACKENDS:
+        raise ValueError(f"Unknown image backend: {name}")
+    return IMAGE_BACKENDS[name]()
@@ -0,0 +1,94 @@
+import base64
+import requests
+from artifacts import ImageArtifact
+from utils import create_error_image
+from scheduler import QuotaTimeout, PRIORITY_NAMES, INTERACTIVE
+from config import SERVICE_REQUEST_TIMEOUT
+
+class ServiceClient:
+    """Client for the local HTTP service with the same interface as ContentGenerator"""
+
+    def __init__(self, base_url):
+        self.base_url = base_url.rstrip('/')
+        self.session = requests.Session()
+
+    def _get(self, path, priority=INTERACTIVE):
+        response = self.session.get(f"{self.base_url}{path}", headers={'X-Priority': PRIORITY_NAMES[priority]},
+                                    timeout=SERVICE_REQUEST_TIMEOUT)
+        return self._parse(response)
+
+    def _post(self, path, payload, priority=INTERACTIVE):
+        response = self.session.post(f"{self.base_url}{path}", json=payload, headers={'X-Priority': PRIORITY_NAMES[priority]},
+                                     timeout=SERVICE_REQUEST_TIMEOUT)
+        return self._parse(response)
+
+    @staticmethod
+    def _parse(response):
+        try:
+            data = response.json()
+        except ValueError:
+            response.raise_for_status()
+            raise
+        if response.status_code == 429:
+            raise QuotaTimeout(data.get('error', 'Quota exceeded'), float(response.headers.get('Retry-After', 0)))
+        if not response.ok:
+            raise Exception(f"Service error ({response.status_code}): {data.get('error', 'unknown error')}")
+        return data
+
+    def health(self):
+        """Return the service health and metrics"""
+        return self._get('/health')
+
+    def fetch_top_movies(self, priority=INTERACTIVE):
+        """Fetch the top movies list through the service"""
+        return self._get('/movies', priority)['movies']
+
+    def fetch_movie_details(self, movie_data, priority=INTERACTIVE):
+        """Fetch movie details through the service"""
+        return self._post('/movie', {'id': movie_data['id'], 'title': movie_data['title']}, priority)
+
+    def generate_movie_dialogue(self, movie_title, storyline, character_names, num_characters, dialogue_length, priority=INTERACTIVE):
+        """Generate a dialogue for movie characters through the service"""
+        try:
+            return self._post('/dialogue', {
+                'movie_title': movie_title,
+                'storyline': storyline,
+                'character_names': character_names,
+                'num_characters': num_characters,
+                'dialogue_length': dialogue_length
+            }, priority)['text']
+        except QuotaTimeout:
+            raise
+        except Exception as e:
+            print(f"Dialogue generation failed: {e}")
+            return f"Failed to generate dialogue: {str(e)}"
+
+    def generate_scene_description(self, movie_title, storyline, priority=INTERACTIVE):
+        """Generate a scene description through the service"""
+        try:
+            return self._post('/scene', {
+                'movie_title': movie_title,
+                'storyline': storyline
+            }, priority)['text']
+        except QuotaTimeout:
+            raise
+        except Exception as e:
+            print(f"Scene description generation failed: {e}")
+            return f"Failed to generate scene description: {str(e)}"
+
+    def generate_movie_image(self, movie_title, scene_description, location, characters_description, style, priority=INTERACTIVE):
+        """Generate a movie scene image through the service"""
+        try:
+            image = self._post('/image', {
+                'movie_title': movie_title,
+                'scene_description': scene_description,
+                'location': location,
+                'characters_description': characters_description,
+                'style': style
+            }, priority)['image']
+            return ImageArtifact(base64.b64decode(image)) if image else None
+        except QuotaTimeout:
+            raise
+        except Exception as e:
+            print(f"Exception in image generation: {e}")
+            return create_error_image(e)
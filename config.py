@@ -7,10 +7,44 @@ VERTEX_AI_IMAGE_MODEL = "imagen-3.0-generate-002"
 API_KEY = "YOUR_GEMINI_API_KEY_HERE"
 PROJECT_ID = "YOUR_VERTEX_AI_PROJECT_ID_HERE"
 
+# Generation backends: "gemini" / "vertex" call the real APIs,
+# "local" uses the offline stand-in from backends.py (no quota needed)
+TEXT_BACKEND = "gemini"
+IMAGE_BACKEND = "vertex"
+
+# Local stand-in backend settings (for offline load testing)
+LOCAL_BACKEND_LATENCY = 0.5         # Base latency per call in seconds
+LOCAL_BACKEND_JITTER = 0.2          # Random +/- spread around the base latency in seconds
+LOCAL_BACKEND_ERROR_RATE = 0.0      # Probability (0-1) that a call raises a simulated error
+LOCAL_BACKEND_TEXT_WORDS = 200      # Number of words in generated text
+LOCAL_BACKEND_IMAGE_SIZE = (600, 400)
+LOCAL_BACKEND_SEED = 0              # Seed for latency, jitter and error sampling
+
 # Web Scraping Settings
 IMDB_TOP_MOVIES_URL = "https://www.imdb.com/chart/top/"
 IMDB_BASE_URL = "https://www.imdb.com"
 
+# Local HTTP service settings (python main.py serve)
+SERVICE_HOST = "127.0.0.1"
+SERVICE_PORT = 8765
+SERVICE_MAX_CONCURRENCY = 4         # Requests processed at the same time
+SERVICE_INTERACTIVE_WORKERS = 1     # Workers background requests may never occupy
+SERVICE_QUEUE_SIZE = 32             # Requests waiting for a worker before new ones are rejected
+SERVICE_REQUEST_TIMEOUT = 300       # Seconds a client waits for a response
+SERVICE_URL = None                  # e.g. "http://127.0.0.1:8765" to make the Tk client use a running service
+
+# Quota scheduler budgets per outbound service (None means unlimited)
+SCHEDULER_BUDGETS = {
+    "text": {"rpm": 15, "tpm": 1000000},    # Text backend (Gemini)
+    "image": {"rpm": 5, "tpm": None},       # Image backend (Vertex AI Imagen)
+    "imdb": {"rpm": 30, "tpm": None}        # IMDb pages and Cinemagoer lookups
+}
+SCHEDULER_BACKGROUND_SHARE = 0.8    # Fraction of each budget background work may use
+# Seconds a call may wait for quota before failing (None waits forever). Interactive
+# calls run on the UI thread when the desktop app calls the APIs directly, so keep it short
+SCHEDULER_INTERACTIVE_MAX_WAIT = 5
+SCHEDULER_BACKGROUND_MAX_WAIT = 120
+
 # UI Colors and styling constants
 DARK_BG = "#2c3e50"
 LIGHT_BG = "#ecf0f1"
@@ -22,4 +56,10 @@ HOVER_COLOR = "#1f618d"
 # File paths
 SAVE_DIRECTORY = "saved_content"
 DIALOGUE_FILENAME = "generated_dialogue.txt"
-IMAGE_FILENAME = "generated_image.png"
+IMAGE_FILENAME = "generated_image"   # The extension follows the saved format
+
+# Saved image output
+IMAGE_SAVE_FORMAT = None            # None keeps the generated encoding as-is, or "WEBP", "JPEG", "PNG"
+IMAGE_SAVE_QUALITY = 85             # Quality for lossy formats (1-100)
+THUMBNAIL_SIZE = (256, 256)         # Maximum thumbnail size, None disables thumbnails
+THUMBNAIL_SUFFIX = "_thumb"
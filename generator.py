@@ -1,57 +1,54 @@
-﻿import google.generativeai as genai
-from vertexai.preview.vision_models import ImageGenerationModel
-import vertexai
-import io
-from utils import create_fallback_image, create_error_image
-from config import (
-    GEMINI_MODEL_NAME,
-    VERTEX_AI_LOCATION,
-    VERTEX_AI_IMAGE_MODEL,
-    API_KEY,
-    PROJECT_ID
-)
+﻿from utils import create_fallback_image, create_error_image
+from backends import create_text_backend, create_image_backend
+from scheduler import scheduler, estimate_tokens, QuotaTimeout, INTERACTIVE
+from config import TEXT_BACKEND, IMAGE_BACKEND
 
 class ContentGenerator:
-    def __init__(self):
-        self.gemini_model = None
-        self.vertex_ai_model = None
-        self.initialize_gemini()
-        self.initialize_vertex_ai()
-
-    def initialize_gemini(self):
-        """Initialize the Gemini text generation model"""
+    def __init__(self, text_backend=None, image_backend=None):
+        self.text_backend = text_backend
+        self.image_backend = image_backend
+        if self.text_backend is None:
+            self.initialize_text_backend()
+        if self.image_backend is None:
+            self.initialize_image_backend()
+
+    def initialize_text_backend(self):
+        """Initialize the configured text generation backend"""
         try:
-            genai.configure(api_key=API_KEY)
-            self.gemini_model = genai.GenerativeModel(model_name=GEMINI_MODEL_NAME)
-            print(f"Successfully initialized Gemini with model: {GEMINI_MODEL_NAME}")
+            self.text_backend = create_text_backend(TEXT_BACKEND)
+            print(f"Successfully initialized text backend: {self.text_backend.name}")
         except Exception as e:
-            print(f"Error initializing Gemini: {e}")
-            self.gemini_model = None
+            print(f"Error initializing text backend '{TEXT_BACKEND}': {e}")
+            self.text_backend = None
 
-    def initialize_vertex_ai(self):
-        """Initialize the Vertex AI image generation model"""
+    def initialize_image_backend(self):
+        """Initialize the configured image generation backend"""
         try:
-            vertexai.init(project=PROJECT_ID, location=VERTEX_AI_LOCATION)
-            self.vertex_ai_model = ImageGenerationModel.from_pretrained(VERTEX_AI_IMAGE_MODEL)
-            print(f"Successfully initialized Vertex AI with model: {VERTEX_AI_IMAGE_MODEL}")
+            self.image_backend = create_image_backend(IMAGE_BACKEND)
+            print(f"Successfully initialized image backend: {self.image_backend.name}")
         except Exception as e:
-            print(f"Error initializing Vertex AI: {e}")
-            self.vertex_ai_model = None
+            print(f"Error initializing image backend '{IMAGE_BACKEND}': {e}")
+            self.image_backend = None
 
-    def generate_dialogue(self, prompt):
-        """Generate dialogue using the Gemini model"""
+    def generate_dialogue(self, prompt, priority=INTERACTIVE):
+        """Generate dialogue using the text backend"""
         try:
-            if not self.gemini_model:
-                raise Exception("Gemini model not initialized")
+            if not self.text_backend:
+                raise Exception("Text backend not initialized")
 
             enhanced_prompt = prompt + " Format the dialogue with character names in bold (using ** markers) followed by their lines. For example: **Character Name**: Their dialogue line."
-            response = self.gemini_model.generate_content(enhanced_prompt)
-            return response.text
+            scheduler.acquire("text", estimate_tokens(enhanced_prompt), priority)
+            text = self.text_backend.generate_text(enhanced_prompt)
+            # Output tokens count against the quota as well
+            scheduler.record("text", estimate_tokens(text))
+            return text
+        except QuotaTimeout:
+            raise
         except Exception as e:
             print(f"Dialogue generation failed: {e}")
             return f"Failed to generate dialogue: {str(e)}"
 
-    def generate_movie_dialogue(self, movie_title, storyline, character_names, num_characters, dialogue_length):
+    def generate_movie_dialogue(self, movie_title, storyline, character_names, num_characters, dialogue_length, priority=INTERACTIVE):
         """Generate a dialogue for movie characters"""
         character_str = ", ".join(character_names[:num_characters])
         dialogue_prompt = f"""Generate a dialogue between {num_characters} characters: {character_str}, with a maximum of {dialogue_length} words, based on the following storyline: {storyline}, and movie: {movie_title}. 
@@ -61,9 +58,9 @@ class ContentGenerator:
         **Another Character Name**: Another spoken line.
         Only one character name can come before each sentence. So, think of it like a play script and write it."""
 
-        return self.generate_dialogue(dialogue_prompt)
+        return self.generate_dialogue(dialogue_prompt, priority)
 
-    def generate_scene_description(self, movie_title, storyline):
+    def generate_scene_description(self, movie_title, storyline, priority=INTERACTIVE):
         """Generate a scene description for image generation"""
         scene_description_prompt = f"""Based on the movie '{movie_title}' with storyline: {storyline}, create a detailed scene description for image generation.
         Include visual elements like:
@@ -73,51 +70,36 @@ class ContentGenerator:
         - The physical appearance and positioning of characters
         - Any distinctive visual style elements from the movie"""
 
-        return self.generate_dialogue(scene_description_prompt)
+        return self.generate_dialogue(scene_description_prompt, priority)
 
-    def generate_image(self, prompt):
-        """Generate an image using the Vertex AI model"""
+    def generate_image(self, prompt, priority=INTERACTIVE):
+        """Generate an image using the image backend"""
         try:
-            if not self.vertex_ai_model:
-                raise Exception("Vertex AI model not initialized")
+            if not self.image_backend:
+                raise Exception("Image backend not initialized")
 
             # Truncate prompt if too long
             if len(prompt) > 1000:
                 prompt = prompt[:1000] + "..."
 
-            response = self.vertex_ai_model.generate_images(
-                prompt=prompt,
-                number_of_images=1
-            )
-
-            if hasattr(response, 'images') and response.images:
-                img = response.images[0]
-
-                if hasattr(img, '_image_bytes'):
-                    return img._image_bytes
-
-                if hasattr(img, '_loaded_bytes'):
-                    return img._loaded_bytes
-
-                if hasattr(img, 'bytes'):
-                    return img.bytes
-
-                if hasattr(img, '_pil_image') and img._pil_image is not None:
-                    img_byte_arr = io.BytesIO()
-                    img._pil_image.save(img_byte_arr, format='PNG')
-                    return img_byte_arr.getvalue()
+            scheduler.acquire("image", priority=priority)
+            artifact = self.image_backend.generate_image(prompt)
+            if artifact:
+                return artifact
 
             return create_fallback_image()
 
+        except QuotaTimeout:
+            raise
         except Exception as e:
             print(f"Exception in image generation: {e}")
             return create_error_image(e)
 
-    def generate_movie_image(self, movie_title, scene_description, location, characters_description, style):
+    def generate_movie_image(self, movie_title, scene_description, location, characters_description, style, priority=INTERACTIVE):
         """Generate a movie scene image"""
         image_prompt = f"""A cinematic scene from the movie '{movie_title}'. {scene_description}
         Setting: {location}, Characters: {characters_description}
         Atmosphere: {movie_title}'s atmosphere
         Style: {style}, highly detailed, professional movie production quality"""
 
-        return self.generate_image(image_prompt)
+        return self.generate_image(image_prompt, priority)
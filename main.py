@@ -1,10 +1,26 @@
-﻿import tkinter as tk
+﻿import argparse
+import tkinter as tk
 from ui import MovieApp
+from config import SERVICE_HOST, SERVICE_PORT, SERVICE_URL
 
 def main():
     """Application entry point"""
+    parser = argparse.ArgumentParser(description="PDA-226 Movie Dialogue and Image Generator")
+    parser.add_argument("command", nargs="?", choices=["gui", "serve"], default="gui",
+                        help="'gui' starts the desktop client, 'serve' starts the local HTTP service")
+    parser.add_argument("--host", default=SERVICE_HOST, help="Host for the HTTP service")
+    parser.add_argument("--port", type=int, default=SERVICE_PORT, help="Port for the HTTP service")
+    parser.add_argument("--service-url", default=SERVICE_URL,
+                        help="URL of a running service for the desktop client to use")
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        from server import serve
+        serve(args.host, args.port)
+        return
+
     root = tk.Tk()
-    app = MovieApp(root)
+    app = MovieApp(root, service_url=args.service_url)
     root.mainloop()
 
 if __name__ == "__main__":
@@ -0,0 +1,119 @@
+import re
+import requests
+from bs4 import BeautifulSoup
+from imdb import Cinemagoer
+from config import IMDB_TOP_MOVIES_URL, IMDB_BASE_URL
+from utils import get_headers
+from scheduler import scheduler, INTERACTIVE
+
+def fetch_top_movies(priority=INTERACTIVE):
+    """Fetch the top movies list from IMDb as a list of {title, id, url} dicts"""
+    scheduler.acquire("imdb", priority=priority)
+    response = requests.get(IMDB_TOP_MOVIES_URL, headers=get_headers())
+    response.raise_for_status()
+
+    soup = BeautifulSoup(response.text, 'html.parser')
+    movies_data = []
+
+    # Find all movie links and titles
+    links = soup.find_all('a')
+    for link in links:
+        href = link.get('href', '')
+        if href.startswith('/title/tt') and '/tt' in href and link.text:
+            title = link.text.strip()
+            if title and len(title) > 1:
+                if re.match(r'^\d+\.', title):
+                    title = re.sub(r'^\d+\.\s*', '', title)
+
+                movie_id = re.search(r'/title/(tt\d+)', href).group(1)
+                movie_url = f"{IMDB_BASE_URL}{href}"
+
+                if title and not any(m['title'] == title for m in movies_data):
+                    movies_data.append({
+                        'title': title,
+                        'id': movie_id,
+                        'url': movie_url
+                    })
+
+    return movies_data
+
+def fetch_movie_details(movie_data, priority=INTERACTIVE):
+    """Fetch details for a movie from IMDb and Cinemagoer"""
+    movie = None
+    scheduler.acquire("imdb", priority=priority)
+    movies = Cinemagoer().search_movie(movie_data['title'])
+    if movies:
+        scheduler.acquire("imdb", priority=priority)
+        movie = Cinemagoer().get_movie(movies[0].movieID)
+
+    # Fetch the movie page
+    scheduler.acquire("imdb", priority=priority)
+    response = requests.get(movie_data['url'], headers=get_headers())
+    response.raise_for_status()
+
+    soup = BeautifulSoup(response.text, 'html.parser')
+
+    # Extract key details
+    details = []
+    detail_elems = soup.select('div.sc-bf57f3f2-0 a.ipc-link')
+    if detail_elems:
+        for detail in detail_elems:
+            details.append(detail.text.strip())
+    # Poster Link
+    poster_link = soup.select_one("a.ipc-lockup-overlay")["href"]
+    # Rating
+    rating_elem = soup.select_one('span.sc-d541859f-1')
+    rating = rating_elem.text.strip() if rating_elem else 'Unknown'
+
+    # Genre
+    genres = []
+    genre_elems = soup.select('div.ipc-chip-list a.ipc-chip')
+    if genre_elems:
+        for genre in genre_elems:
+            genres.append(genre.text.strip())
+
+    # Director
+    director = ""
+    director_label = soup.find('span',
+                               class_='ipc-metadata-list-item__label ipc-metadata-list-item__label--btn ipc-btn--not-interactable',
+                               string='Director')
+    if director_label:
+        director_li = director_label.find_parent('li')
+        director_link = director_li.find('a', class_='ipc-metadata-list-item__list-content-item ipc-metadata-list-item__list-content-item--link')
+        if director_link:
+            director = director_link.get_text(strip=True)
+
+    # Cast
+    cast = []
+    cast_list = soup.select('div[data-testid="title-cast-item"]')
+    for i, actor in enumerate(cast_list):
+        if i >= 10:  # Get first 10 cast members
+            break
+        actor_name = actor.select_one('a[data-testid="title-cast-item__actor"]')
+        if actor_name:
+            cast.append(actor_name.text.strip())
+
+    # Characters
+    chars = []
+    char_elems = soup.select('li.ipc-inline-list__item span.sc-cd7dc4b7-4')
+    if char_elems:
+        for char in char_elems:
+            chars.append(char.text.strip())
+
+    # Storyline
+    storyline = movie.get('plot outline', 'No storyline available.') if movie else 'No storyline available.'
+
+    return {
+        'id': movie_data['id'],
+        'title': movie_data['title'],
+        'url': movie_data['url'],
+        'poster': f"{IMDB_BASE_URL}{poster_link.split('?')[0]}",
+        'year': details[0] if details else '',
+        'parental_guide': details[1] if len(details) > 1 else '',
+        'rating': rating,
+        'directors': director,
+        'genres': genres,
+        'cast': cast,
+        'chars': chars,
+        'storyline': storyline
+    }
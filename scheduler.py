@@ -0,0 +1,207 @@
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+from config import (
+    SCHEDULER_BUDGETS,
+    SCHEDULER_BACKGROUND_SHARE,
+    SCHEDULER_INTERACTIVE_MAX_WAIT,
+    SCHEDULER_BACKGROUND_MAX_WAIT
+)
+
+# Priority classes, lower values are served first
+INTERACTIVE = 0
+BACKGROUND = 1
+
+PRIORITY_NAMES = {
+    INTERACTIVE: "interactive",
+    BACKGROUND: "background"
+}
+
+WINDOW = 60.0  # Budgets are per minute
+
+class QuotaTimeout(Exception):
+    """Raised when a call cannot get quota within its maximum wait"""
+
+    def __init__(self, message, retry_after):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def parse_priority(value):
+    """Convert a priority name or number to a priority class"""
+    if value in PRIORITY_NAMES:
+        return value
+    for priority, name in PRIORITY_NAMES.items():
+        if str(value).lower() == name:
+            return priority
+    raise ValueError(f"Unknown priority: {value}")
+
+def estimate_tokens(text):
+    """Rough token estimate used for tokens-per-minute budgets"""
+    return len(text) // 4 + 1
+
+
+class _Budget:
+    """Sliding one-minute window of requests and tokens for one service"""
+
+    def __init__(self, rpm=None, tpm=None):
+        self.rpm = rpm
+        self.tpm = tpm
+        self._events = deque()
+        self._requests = 0
+        self._tokens = 0
+
+    def _expire(self, now):
+        while self._events and self._events[0][0] <= now - WINDOW:
+            _, requests, tokens = self._events.popleft()
+            self._requests -= requests
+            self._tokens -= tokens
+
+    def usage(self, now):
+        self._expire(now)
+        return self._requests, self._tokens
+
+    def wait_time(self, tokens, share, now):
+        """Seconds until a call of the given size fits in the share of the budget"""
+        self._expire(now)
+        if not self._events:
+            return 0.0
+
+        request_limit = self.rpm * share if self.rpm else None
+        token_limit = self.tpm * share if self.tpm else None
+        if token_limit is not None:
+            tokens = min(tokens, token_limit)
+
+        # Walk the window oldest first until enough usage has expired to fit this call
+        requests = self._requests
+        used_tokens = self._tokens
+        available_at = now
+        for timestamp, event_requests, event_tokens in self._events:
+            requests_ok = request_limit is None or requests + 1 <= request_limit
+            tokens_ok = token_limit is None or used_tokens + tokens <= token_limit
+            if requests_ok and tokens_ok:
+                break
+            requests -= event_requests
+            used_tokens -= event_tokens
+            available_at = timestamp + WINDOW
+        return max(0.0, available_at - now)
+
+    def record(self, tokens, now, requests=1):
+        self._events.append((now, requests, tokens))
+        self._requests += requests
+        self._tokens += tokens
+
+
+class QuotaScheduler:
+    """Admits outbound calls per service within requests/tokens per minute budgets.
+
+    Waiting calls are served in priority order, so interactive work always goes
+    ahead of background work. Background calls may only use part of each
+    budget, which leaves headroom for interactive calls arriving later.
+    Calls block until they fit instead of being sent and rejected with a 429,
+    and fail with QuotaTimeout as soon as it is clear they cannot fit within
+    the maximum wait for their priority.
+    """
+
+    def __init__(self, budgets=SCHEDULER_BUDGETS, background_share=SCHEDULER_BACKGROUND_SHARE,
+                 interactive_max_wait=SCHEDULER_INTERACTIVE_MAX_WAIT,
+                 background_max_wait=SCHEDULER_BACKGROUND_MAX_WAIT):
+        self.background_share = background_share
+        self.max_wait = {
+            INTERACTIVE: interactive_max_wait,
+            BACKGROUND: background_max_wait
+        }
+        self._budgets = {service: _Budget(**limits) for service, limits in budgets.items()}
+        self._waiting = {service: [] for service in budgets}
+        self._cond = threading.Condition()
+        self._sequence = itertools.count()
+        self._stats = {}
+
+    def acquire(self, service, tokens=0, priority=INTERACTIVE):
+        """Block until the call fits the service budget, then record it"""
+        if service not in self._budgets:
+            return 0.0
+
+        budget = self._budgets[service]
+        waiting = self._waiting[service]
+        share = 1.0 if priority == INTERACTIVE else self.background_share
+        ticket = (priority, next(self._sequence))
+        started = time.monotonic()
+        max_wait = self.max_wait[priority]
+        deadline = started + max_wait if max_wait is not None else None
+
+        with self._cond:
+            heapq.heappush(waiting, ticket)
+            try:
+                while True:
+                    now = time.monotonic()
+                    delay = budget.wait_time(tokens, share, now) if waiting[0] == ticket else None
+                    if delay == 0.0:
+                        break
+                    if deadline is not None:
+                        # Give up right away when the quota cannot free up before the deadline
+                        if now >= deadline or (delay is not None and now + delay > deadline):
+                            self._record_stats(service, priority, now - started, timed_out=True)
+                            retry_after = delay if delay is not None else budget.wait_time(tokens, share, now)
+                            raise QuotaTimeout(f"No {service} quota available within {max_wait}s", retry_after)
+                        delay = min(delay, deadline - now) if delay is not None else deadline - now
+                    self._cond.wait(delay)
+
+                budget.record(tokens, now)
+                self._record_stats(service, priority, now - started)
+                return now - started
+            finally:
+                waiting.remove(ticket)
+                heapq.heapify(waiting)
+                self._cond.notify_all()
+
+    def record(self, service, tokens):
+        """Count tokens that are only known after a call, such as the response size"""
+        if service not in self._budgets:
+            return
+
+        with self._cond:
+            self._budgets[service].record(tokens, time.monotonic(), requests=0)
+            self._cond.notify_all()
+
+    def _record_stats(self, service, priority, queue_wait, timed_out=False):
+        stats = self._stats.setdefault((service, priority), {
+            'granted': 0,
+            'timed_out': 0,
+            'queue_wait_total': 0.0,
+            'queue_wait_max': 0.0
+        })
+        stats['timed_out' if timed_out else 'granted'] += 1
+        stats['queue_wait_total'] += queue_wait
+        stats['queue_wait_max'] = max(stats['queue_wait_max'], queue_wait)
+
+    def metrics(self):
+        """Return per-service usage and queue-wait metrics"""
+        with self._cond:
+            now = time.monotonic()
+            result = {}
+            for service, budget in self._budgets.items():
+                requests, tokens = budget.usage(now)
+                result[service] = {
+                    'rpm': budget.rpm,
+                    'tpm': budget.tpm,
+                    'requests_last_minute': requests,
+                    'tokens_last_minute': tokens,
+                    'waiting': len(self._waiting[service]),
+                    'priorities': {}
+                }
+            for (service, priority), stats in self._stats.items():
+                calls = stats['granted'] + stats['timed_out']
+                result[service]['priorities'][PRIORITY_NAMES[priority]] = {
+                    'granted': stats['granted'],
+                    'timed_out': stats['timed_out'],
+                    'avg_queue_wait': stats['queue_wait_total'] / calls,
+                    'max_queue_wait': stats['queue_wait_max']
+                }
+            return result
+
+
+# Shared scheduler for every outbound call in the application
+scheduler = QuotaScheduler()
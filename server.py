@@ -0,0 +1,317 @@
+import base64
+import inspect
+import json
+import math
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from generator import ContentGenerator
+from movies import fetch_top_movies, fetch_movie_details
+from scheduler import scheduler, parse_priority, QuotaTimeout, INTERACTIVE, BACKGROUND
+from config import (
+    IMDB_BASE_URL,
+    SERVICE_HOST,
+    SERVICE_PORT,
+    SERVICE_MAX_CONCURRENCY,
+    SERVICE_INTERACTIVE_WORKERS,
+    SERVICE_QUEUE_SIZE,
+    SERVICE_REQUEST_TIMEOUT
+)
+
+class ServiceBusy(Exception):
+    """Raised when the request queue is full"""
+
+
+class InvalidRequest(Exception):
+    """Raised when a request names an unknown endpoint or has invalid parameters"""
+
+
+class _Job:
+    """A queued or running request and the Future its callers wait on"""
+
+    def __init__(self, key, kind, params, priority):
+        self.key = key
+        self.kind = kind
+        self.params = params
+        self.priority = priority
+        self.future = Future()
+        self.enqueued = time.monotonic()
+        self.started = None
+
+
+class RequestBroker:
+    """Runs service requests on a fixed pool of workers fed by a bounded queue.
+
+    Interactive requests are always picked up first, and background requests
+    may only occupy part of the pool, so background work that is waiting for
+    quota can never hold every worker. Identical requests that arrive while
+    one is queued or running share its result instead of being executed again;
+    an interactive duplicate of a queued background request promotes it, and
+    one of a running background request runs as its own interactive job.
+    """
+
+    # Parameters filled in by the broker that clients may not send
+    RESERVED_PARAMS = ('priority',)
+
+    def __init__(self, handlers, max_workers=SERVICE_MAX_CONCURRENCY, queue_size=SERVICE_QUEUE_SIZE,
+                 interactive_workers=SERVICE_INTERACTIVE_WORKERS):
+        self.handlers = handlers
+        self.max_workers = max_workers
+        self.max_background = max(1, max_workers - interactive_workers)
+        self.queue_size = queue_size
+        self._queues = {INTERACTIVE: deque(), BACKGROUND: deque()}
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._work_available = threading.Condition(self._lock)
+        self._active = {INTERACTIVE: 0, BACKGROUND: 0}
+        self._started = time.time()
+        self._counters = {
+            'received': 0,
+            'coalesced': 0,
+            'promoted': 0,
+            'rejected': 0,
+            'completed': 0,
+            'failed': 0
+        }
+        self._timings = {}
+
+        for i in range(max_workers):
+            worker = threading.Thread(target=self._worker, name=f"service-worker-{i}", daemon=True)
+            worker.start()
+
+    def submit(self, kind, params, priority=INTERACTIVE):
+        """Queue a request and return a Future for its result"""
+        if kind not in self.handlers:
+            raise InvalidRequest(f"Unknown request type: {kind}")
+
+        reserved = [name for name in self.RESERVED_PARAMS if name in params]
+        if reserved:
+            raise InvalidRequest(f"Reserved parameters: {', '.join(reserved)}")
+        try:
+            inspect.signature(self.handlers[kind]).bind(priority=priority, **params)
+        except TypeError as e:
+            raise InvalidRequest(f"Invalid parameters: {e}")
+
+        key = (kind, json.dumps(params, sort_keys=True))
+        with self._lock:
+            self._counters['received'] += 1
+            job = self._pending.get(key)
+            if job is not None and priority < job.priority and job.started is None:
+                self._queues[job.priority].remove(job)
+                job.priority = priority
+                self._queues[priority].append(job)
+                self._counters['coalesced'] += 1
+                self._counters['promoted'] += 1
+                self._work_available.notify_all()
+                return job.future
+            # A running background job may still be waiting for background quota,
+            # so a higher priority duplicate only joins jobs of its own priority
+            if job is not None and priority >= job.priority:
+                self._counters['coalesced'] += 1
+                return job.future
+
+            if self._queued() >= self.queue_size:
+                self._counters['rejected'] += 1
+                raise ServiceBusy("Request queue is full")
+
+            job = _Job(key, kind, params, priority)
+            self._queues[priority].append(job)
+            self._pending[key] = job
+            self._work_available.notify_all()
+        return job.future
+
+    def _queued(self):
+        return sum(len(jobs) for jobs in self._queues.values())
+
+    def _next_job(self):
+        """Wait for the next job this worker may run; called with the lock held"""
+        while True:
+            if self._queues[INTERACTIVE]:
+                return self._queues[INTERACTIVE].popleft()
+            if self._queues[BACKGROUND] and self._active[BACKGROUND] < self.max_background:
+                return self._queues[BACKGROUND].popleft()
+            self._work_available.wait()
+
+    def _worker(self):
+        while True:
+            with self._lock:
+                job = self._next_job()
+                job.started = time.monotonic()
+                self._active[job.priority] += 1
+
+            succeeded = False
+            try:
+                result = self.handlers[job.kind](priority=job.priority, **job.params)
+            except Exception as e:
+                job.future.set_exception(e)
+            else:
+                job.future.set_result(result)
+                succeeded = True
+            finally:
+                finished = time.monotonic()
+                with self._lock:
+                    self._active[job.priority] -= 1
+                    if self._pending.get(job.key) is job:
+                        del self._pending[job.key]
+                    self._counters['completed' if succeeded else 'failed'] += 1
+                    self._record_timing(job.kind, job.started - job.enqueued, finished - job.started)
+                    self._work_available.notify_all()
+
+    def _record_timing(self, kind, queue_wait, run_time):
+        stats = self._timings.setdefault(kind, {
+            'count': 0,
+            'queue_wait_total': 0.0,
+            'run_time_total': 0.0,
+            'run_time_max': 0.0
+        })
+        stats['count'] += 1
+        stats['queue_wait_total'] += queue_wait
+        stats['run_time_total'] += run_time
+        stats['run_time_max'] = max(stats['run_time_max'], run_time)
+
+    def metrics(self):
+        """Return a snapshot of queue and request metrics"""
+        with self._lock:
+            timings = {}
+            for kind, stats in self._timings.items():
+                timings[kind] = {
+                    'count': stats['count'],
+                    'avg_queue_wait': stats['queue_wait_total'] / stats['count'],
+                    'avg_run_time': stats['run_time_total'] / stats['count'],
+                    'max_run_time': stats['run_time_max']
+                }
+            return {
+                'uptime': time.time() - self._started,
+                'max_workers': self.max_workers,
+                'max_background_workers': self.max_background,
+                'active': sum(self._active.values()),
+                'active_background': self._active[BACKGROUND],
+                'queued': self._queued(),
+                'queued_background': len(self._queues[BACKGROUND]),
+                'queue_size': self.queue_size,
+                **self._counters,
+                'endpoints': timings,
+                'scheduler': scheduler.metrics()
+            }
+
+
+def create_handlers(generator):
+    """Map service endpoints to the functions that serve them"""
+    def movies(priority=INTERACTIVE):
+        return {'movies': fetch_top_movies(priority)}
+
+    def movie(id, title, priority=INTERACTIVE):
+        # Only ever fetch IMDb title pages, never a URL supplied by the client
+        if not isinstance(id, str) or not re.match(r'^tt\d+$', id):
+            raise InvalidRequest(f"Invalid IMDb title id: {id}")
+        return fetch_movie_details({'id': id, 'title': title, 'url': f"{IMDB_BASE_URL}/title/{id}/"}, priority)
+
+    def dialogue(movie_title, storyline, character_names, num_characters, dialogue_length, priority=INTERACTIVE):
+        return {'text': generator.generate_movie_dialogue(
+            movie_title, storyline, character_names, num_characters, dialogue_length, priority)}
+
+    def scene(movie_title, storyline, priority=INTERACTIVE):
+        return {'text': generator.generate_scene_description(movie_title, storyline, priority)}
+
+    def image(movie_title, scene_description, location, characters_description, style, priority=INTERACTIVE):
+        artifact = generator.generate_movie_image(
+            movie_title, scene_description, location, characters_description, style, priority)
+        return {'image': base64.b64encode(artifact.data).decode('ascii') if artifact else None}
+
+    return {
+        'movies': movies,
+        'movie': movie,
+        'dialogue': dialogue,
+        'scene': scene,
+        'image': image
+    }
+
+
+class ServiceRequestHandler(BaseHTTPRequestHandler):
+    """HTTP/JSON front end for the RequestBroker"""
+    broker = None
+    generator = None
+
+    def do_GET(self):
+        if self.path == '/health':
+            self._send_json(200, {
+                'status': 'ok',
+                'text_backend': getattr(self.generator.text_backend, 'name', None),
+                'image_backend': getattr(self.generator.image_backend, 'name', None),
+                'metrics': self.broker.metrics()
+            })
+        elif self.path == '/metrics':
+            self._send_json(200, self.broker.metrics())
+        elif self.path == '/movies':
+            self._dispatch('movies', {})
+        else:
+            self._send_json(404, {'error': f"Unknown endpoint: {self.path}"})
+
+    def do_POST(self):
+        kind = self.path.strip('/')
+        if kind not in ('movie', 'dialogue', 'scene', 'image'):
+            self._send_json(404, {'error': f"Unknown endpoint: {self.path}"})
+            return
+
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            params = json.loads(self.rfile.read(length) or b'{}')
+            if not isinstance(params, dict):
+                raise ValueError("Request body must be a JSON object")
+        except ValueError as e:
+            self._send_json(400, {'error': f"Invalid request body: {e}"})
+            return
+
+        self._dispatch(kind, params)
+
+    def _dispatch(self, kind, params):
+        try:
+            priority = parse_priority(self.headers.get('X-Priority', INTERACTIVE))
+        except ValueError as e:
+            self._send_json(400, {'error': str(e)})
+            return
+
+        try:
+            future = self.broker.submit(kind, params, priority)
+            result = future.result(timeout=SERVICE_REQUEST_TIMEOUT)
+        except ServiceBusy as e:
+            self._send_json(503, {'error': str(e)})
+        except QuotaTimeout as e:
+            self._send_json(429, {'error': str(e)}, {'Retry-After': str(math.ceil(e.retry_after))})
+        except FutureTimeoutError:
+            self._send_json(504, {'error': "Request timed out"})
+        except InvalidRequest as e:
+            self._send_json(400, {'error': str(e)})
+        except Exception as e:
+            self._send_json(500, {'error': str(e)})
+        else:
+            self._send_json(200, result)
+
+    def _send_json(self, status, payload, headers=None):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def serve(host=SERVICE_HOST, port=SERVICE_PORT):
+    """Run the local HTTP service until interrupted"""
+    generator = ContentGenerator()
+    ServiceRequestHandler.generator = generator
+    ServiceRequestHandler.broker = RequestBroker(create_handlers(generator))
+
+    server = ThreadingHTTPServer((host, port), ServiceRequestHandler)
+    print(f"Serving on http://{host}:{port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
@@ -0,0 +1,61 @@
+import os
+
+from PIL import Image
+
+import utils
+from artifacts import ImageArtifact, encode_image
+
+
+def make_artifact(mode="RGB", size=(600, 400), image_format="PNG"):
+    image = Image.new(mode, size, color=(10, 20, 30, 128)[:len(mode)])
+    return ImageArtifact(encode_image(image, image_format))
+
+
+def test_original_bytes_are_returned_without_reencoding():
+    artifact = make_artifact()
+
+    assert artifact.format == "PNG"
+    assert artifact.encode() is artifact.data
+    assert artifact.encode("png", quality=10) is artifact.data
+
+
+def test_rgba_image_is_converted_for_jpeg():
+    artifact = make_artifact(mode="RGBA")
+
+    encoded = ImageArtifact(artifact.encode("jpg", quality=80))
+    assert encoded.format == "JPEG"
+    assert encoded.image.mode == "RGB"
+
+
+def test_thumbnail_fits_within_size():
+    thumbnail = make_artifact().thumbnail((256, 256), "WEBP")
+
+    assert thumbnail.format == "WEBP"
+    assert thumbnail.size[0] <= 256 and thumbnail.size[1] <= 256
+    assert ImageArtifact(thumbnail.data).size == thumbnail.size
+
+
+def test_saved_extension_follows_the_configured_format(tmp_path, monkeypatch):
+    monkeypatch.setattr(utils, "SAVE_DIRECTORY", str(tmp_path))
+    monkeypatch.setattr(utils, "THUMBNAIL_SIZE", (256, 256))
+    monkeypatch.setattr(utils, "IMAGE_SAVE_FORMAT", "WEBP")
+
+    assert utils.save_image_to_file(make_artifact())
+    assert sorted(os.listdir(tmp_path)) == ["generated_image.webp", "generated_image_thumb.webp"]
+
+
+def test_saving_without_a_format_keeps_the_original_bytes(tmp_path, monkeypatch):
+    monkeypatch.setattr(utils, "SAVE_DIRECTORY", str(tmp_path))
+    monkeypatch.setattr(utils, "THUMBNAIL_SIZE", None)
+    monkeypatch.setattr(utils, "IMAGE_SAVE_FORMAT", None)
+    artifact = make_artifact()
+
+    assert utils.save_image_to_file(artifact)
+    assert os.listdir(tmp_path) == ["generated_image.png"]
+    assert (tmp_path / "generated_image.png").read_bytes() == artifact.data
+
+
+def test_placeholders_are_memoized():
+    assert utils.create_fallback_image() is utils.create_fallback_image()
+    assert utils.create_error_image(Exception("boom")) is utils.create_error_image("boom")
+    assert utils.create_error_image("boom") is not utils.create_error_image("other")
@@ -0,0 +1,40 @@
+import time
+
+import pytest
+
+from backends import LocalTextBackend, LocalImageBackend
+
+
+def test_local_text_is_deterministic_per_prompt():
+    backend = LocalTextBackend(words=50, latency=0, jitter=0)
+
+    text = backend.generate_text("Heat")
+    assert text == LocalTextBackend(words=50, latency=0, jitter=0).generate_text("Heat")
+    assert text != backend.generate_text("Alien")
+    assert sum(len(line.split(": ", 1)[1].split()) for line in text.splitlines()) == 50
+
+
+def test_local_image_is_deterministic_per_prompt():
+    backend = LocalImageBackend(size=(120, 80), latency=0, jitter=0)
+
+    artifact = backend.generate_image("Heat")
+    assert artifact.size == (120, 80)
+    assert artifact.data == backend.generate_image("Heat").data
+    assert artifact.data != backend.generate_image("Alien").data
+
+
+def test_latency_stays_within_jitter_bounds():
+    backend = LocalTextBackend(words=5, latency=0.05, jitter=0.02)
+
+    for _ in range(3):
+        started = time.monotonic()
+        backend.generate_text("Heat")
+        elapsed = time.monotonic() - started
+        assert 0.03 <= elapsed < 0.2
+
+
+def test_error_rate_of_one_always_fails():
+    backend = LocalTextBackend(words=5, latency=0, jitter=0, error_rate=1.0)
+
+    with pytest.raises(Exception, match="Simulated"):
+        backend.generate_text("Heat")
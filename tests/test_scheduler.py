@@ -0,0 +1,16 @@
+import pytest
+
+from scheduler import QuotaScheduler, QuotaTimeout, INTERACTIVE
+
+
+def test_recorded_output_tokens_count_against_the_token_budget():
+    quota = QuotaScheduler({"text": {"rpm": None, "tpm": 1000}}, interactive_max_wait=1)
+
+    quota.acquire("text", 400, INTERACTIVE)
+    quota.record("text", 500)
+
+    usage = quota.metrics()["text"]
+    assert usage["requests_last_minute"] == 1
+    assert usage["tokens_last_minute"] == 900
+    with pytest.raises(QuotaTimeout):
+        quota.acquire("text", 200, INTERACTIVE)
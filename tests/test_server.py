@@ -0,0 +1,117 @@
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+from scheduler import QuotaScheduler, QuotaTimeout, INTERACTIVE, BACKGROUND
+from server import RequestBroker, InvalidRequest, ServiceRequestHandler, create_handlers
+
+
+def make_image_handlers(quota, release=None):
+    """Handlers whose image requests wait for image quota; "busy" ones also wait for release"""
+    def image(prompt, priority=INTERACTIVE):
+        if prompt == "busy":
+            release.wait()
+        quota.acquire("image", priority=priority)
+        return prompt
+
+    return {'image': image}
+
+
+def test_interactive_request_is_served_while_background_waits_for_quota():
+    quota = QuotaScheduler({"image": {"rpm": 5, "tpm": None}}, background_share=0.8,
+                           interactive_max_wait=5, background_max_wait=None)
+    broker = RequestBroker(make_image_handlers(quota), max_workers=4, queue_size=32, interactive_workers=1)
+
+    for i in range(8):
+        broker.submit('image', {'prompt': f"background {i}"}, BACKGROUND)
+    time.sleep(0.2)
+
+    future = broker.submit('image', {'prompt': "interactive"}, INTERACTIVE)
+    assert future.result(timeout=2) == "interactive"
+
+    metrics = broker.metrics()
+    assert metrics['active_background'] == broker.max_background
+
+
+def test_identical_requests_are_coalesced_and_promoted():
+    release = threading.Event()
+    quota = QuotaScheduler({})
+    broker = RequestBroker(make_image_handlers(quota, release), max_workers=2, queue_size=32, interactive_workers=1)
+
+    # Keep the only background worker busy so the next background request stays queued
+    broker.submit('image', {'prompt': "busy"}, BACKGROUND)
+    time.sleep(0.1)
+    queued = broker.submit('image', {'prompt': "same"}, BACKGROUND)
+    promoted = broker.submit('image', {'prompt': "same"}, INTERACTIVE)
+
+    assert promoted is queued
+    assert promoted.result(timeout=2) == "same"
+    metrics = broker.metrics()
+    assert metrics['coalesced'] == 1
+    assert metrics['promoted'] == 1
+    release.set()
+
+
+def test_interactive_duplicate_of_running_background_request_runs_separately():
+    quota = QuotaScheduler({"image": {"rpm": 2, "tpm": None}}, background_share=0.5,
+                           interactive_max_wait=5, background_max_wait=None)
+    broker = RequestBroker(make_image_handlers(quota), max_workers=3, queue_size=32, interactive_workers=1)
+
+    # The first background request uses the whole background share, the second waits for quota
+    broker.submit('image', {'prompt': "first"}, BACKGROUND)
+    time.sleep(0.1)
+    running = broker.submit('image', {'prompt': "same"}, BACKGROUND)
+    time.sleep(0.1)
+
+    interactive = broker.submit('image', {'prompt': "same"}, INTERACTIVE)
+    assert interactive is not running
+    assert interactive.result(timeout=2) == "same"
+    assert not running.done()
+
+
+def test_invalid_parameters_are_rejected_before_queueing():
+    broker = RequestBroker(create_handlers(None), max_workers=1)
+
+    with pytest.raises(InvalidRequest):
+        broker.submit('scene', {'movie_title': "Heat"})
+    with pytest.raises(InvalidRequest):
+        broker.submit('scene', {'movie_title': "Heat", 'storyline': "", 'priority': "background"})
+    with pytest.raises(InvalidRequest):
+        broker.submit('unknown', {})
+    assert broker.metrics()['received'] == 0
+
+
+def test_movie_details_only_accept_imdb_title_ids():
+    broker = RequestBroker(create_handlers(None), max_workers=1)
+
+    with pytest.raises(InvalidRequest):
+        broker.submit('movie', {'id': "tt0113277", 'title': "Heat", 'url': "http://169.254.169.254/"})
+    with pytest.raises(InvalidRequest):
+        broker.submit('movie', {'id': "../../evil", 'title': "Heat"}).result(timeout=2)
+
+
+def test_quota_timeout_is_returned_as_429_with_retry_after(monkeypatch):
+    def scene(movie_title, storyline, priority=INTERACTIVE):
+        raise QuotaTimeout("No text quota available within 5s", 12.5)
+
+    monkeypatch.setattr(ServiceRequestHandler, 'broker', RequestBroker({'scene': scene}, max_workers=1))
+    server = ThreadingHTTPServer(('127.0.0.1', 0), ServiceRequestHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        request = urllib.request.Request(
+            f"http://127.0.0.1:{server.server_port}/scene",
+            data=json.dumps({'movie_title': "Heat", 'storyline': ""}).encode('utf-8'),
+            headers={'Content-Type': 'application/json'}
+        )
+        with pytest.raises(urllib.error.HTTPError) as error:
+            urllib.request.urlopen(request)
+        assert error.value.code == 429
+        assert error.value.headers['Retry-After'] == "13"
+    finally:
+        server.shutdown()
+        server.server_close()
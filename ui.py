@@ -1,28 +1,23 @@
 ﻿import tkinter as tk
 from tkinter import ttk, scrolledtext, messagebox, font
 from PIL import Image, ImageTk
-import io
-import re
-import requests
-from bs4 import BeautifulSoup
-from imdb import Cinemagoer
-import os
 
+import movies
 from config import (
-    IMDB_TOP_MOVIES_URL,
-    IMDB_BASE_URL,
     DARK_BG,
     LIGHT_BG,
     ACCENT_COLOR,
     TEXT_COLOR,
     BUTTON_COLOR,
-    HOVER_COLOR
+    HOVER_COLOR,
+    SERVICE_URL
 )
 from generator import ContentGenerator
-from utils import get_headers, save_dialogue_to_file, save_image_to_file
+from client import ServiceClient
+from utils import save_dialogue_to_file, save_image_to_file
 
 class MovieApp:
-    def __init__(self, parent):
+    def __init__(self, parent, service_url=SERVICE_URL):
         self.root = parent
         self.root.title("PDA-226 Movie Dialogue and Image Generator")
         self.root.geometry("1100x700")
@@ -30,7 +25,14 @@ class MovieApp:
 
         self.current_movie = None
         self.movies_data = []
-        self.generator = ContentGenerator()
+
+        # Either share a running service or call the SDKs and IMDb directly
+        if service_url:
+            self.generator = ServiceClient(service_url)
+            self.movie_source = self.generator
+        else:
+            self.generator = ContentGenerator()
+            self.movie_source = movies
 
         self._apply_theme()
         self._configure_gui()
@@ -216,31 +218,7 @@ class MovieApp:
         try:
             self.set_status("Fetching movie list from IMDb...")
 
-            response = requests.get(IMDB_TOP_MOVIES_URL, headers=get_headers())
-            response.raise_for_status()
-
-            soup = BeautifulSoup(response.text, 'html.parser')
-            movies_data = []
-
-            # Find all movie links and titles
-            links = soup.find_all('a')
-            for link in links:
-                href = link.get('href', '')
-                if href.startswith('/title/tt') and '/tt' in href and link.text:
-                    title = link.text.strip()
-                    if title and len(title) > 1:
-                        if re.match(r'^\d+\.', title):
-                            title = re.sub(r'^\d+\.\s*', '', title)
-
-                        movie_id = re.search(r'/title/(tt\d+)', href).group(1)
-                        movie_url = f"{IMDB_BASE_URL}{href}"
-
-                        if title and not any(m['title'] == title for m in movies_data):
-                            movies_data.append({
-                                'title': title,
-                                'id': movie_id,
-                                'url': movie_url
-                            })
+            movies_data = self.movie_source.fetch_top_movies()
 
             self.movie_listbox.delete(0, tk.END)
 
@@ -285,97 +263,21 @@ class MovieApp:
         """Fetch and display movie details"""
         try:
             self.set_status(f"Fetching details for '{movie_data['title']}'...")
-            movies = Cinemagoer().search_movie(movie_data['title'])
-            if movies:
-                movie = Cinemagoer().get_movie(movies[0].movieID)
-
-                # Store current movie ID and title to prevent redundant fetches
-                self.current_movie_id = {
-                    'id': movies[0].movieID,
-                    'title': movie_data['title']
-                }
-            # Fetch the movie page
-            response = requests.get(movie_data['url'], headers=get_headers())
-            response.raise_for_status()
-
-            soup = BeautifulSoup(response.text, 'html.parser')
-
-            # Extract key details
-            details = []
-            detail_elems = soup.select('div.sc-bf57f3f2-0 a.ipc-link')
-            if detail_elems:
-                for detail in detail_elems:
-                    details.append(detail.text.strip())
-            # Poster Link
-            poster_link = soup.select_one("a.ipc-lockup-overlay")["href"]
-            # Rating
-            rating_elem = soup.select_one('span.sc-d541859f-1')
-            rating = rating_elem.text.strip() if rating_elem else 'Unknown'
-
-            # Genre
-            genres = []
-            genre_elems = soup.select('div.ipc-chip-list a.ipc-chip')
-            if genre_elems:
-                for genre in genre_elems:
-                    genres.append(genre.text.strip())
-
-            # Director
-            director = ""
-            director_label = soup.find('span',
-                                       class_='ipc-metadata-list-item__label ipc-metadata-list-item__label--btn ipc-btn--not-interactable',
-                                       string='Director')
-            if director_label:
-                director_li = director_label.find_parent('li')
-                director_link = director_li.find('a', class_='ipc-metadata-list-item__list-content-item ipc-metadata-list-item__list-content-item--link')
-                if director_link:
-                    director = director_link.get_text(strip=True)
-
-            # Cast
-            cast = []
-            cast_list = soup.select('div[data-testid="title-cast-item"]')
-            for i, actor in enumerate(cast_list):
-                if i >= 10:  # Get first 10 cast members
-                    break
-                actor_name = actor.select_one('a[data-testid="title-cast-item__actor"]')
-                if actor_name:
-                    cast.append(actor_name.text.strip())
-
-            # Characters
-            chars = []
-            char_elems = soup.select('li.ipc-inline-list__item span.sc-cd7dc4b7-4')
-            if char_elems:
-                for char in char_elems:
-                    chars.append(char.text.strip())
-
-            # Storyline
-            storyline = movie.get('plot outline', 'No storyline available.')
-
-            # Store current movie
-            self.current_movie = {
-                'id': movie_data['id'],
-                'title': movie_data['title'],
-                'url': movie_data['url'],
-                'year': details[0] if details else '',
-                'rating': rating,
-                'directors': director,
-                'genres': genres,
-                'cast': cast,
-                'chars': chars,
-                'storyline': storyline
-            }
+            self.current_movie = self.movie_source.fetch_movie_details(movie_data)
+            movie = self.current_movie
 
             # Format the details text
-            details_text = f"🎬 Title: {movie_data['title']}\n\n"
-            details_text += f"🖼 Poster: https://www.imdb.com{poster_link.split('?')[0]}\n\n"
-            details_text += f"📍 Year: {details[0] if details else 'Unknown'}\n\n"
-            details_text += f"🛑 Parental Guide(US): {details[1] if len(details) > 1 else 'Unknown'}\n\n"
-            details_text += f"⭐ Rating: {rating}/10\n\n"
-            details_text += f"🎭 Genres: {', '.join(genres) if genres else 'Unknown'}\n\n"
-            details_text += f"🎬 Director: {director}\n\n"
-            details_text += f"👥 Cast: {', '.join(cast) if cast else 'Unknown'}\n\n"
-            details_text += f"👥 Characters: {', '.join(chars) if chars else 'Unknown'}\n\n"
-            details_text += f"🔗 IMDb URL: {movie_data['url'].split('?')[0]}\n\n"
-            details_text += f"📝 Storyline:\n{storyline}\n\n"
+            details_text = f"🎬 Title: {movie['title']}\n\n"
+            details_text += f"🖼 Poster: {movie['poster']}\n\n"
+            details_text += f"📍 Year: {movie['year'] or 'Unknown'}\n\n"
+            details_text += f"🛑 Parental Guide(US): {movie['parental_guide'] or 'Unknown'}\n\n"
+            details_text += f"⭐ Rating: {movie['rating']}/10\n\n"
+            details_text += f"🎭 Genres: {', '.join(movie['genres']) if movie['genres'] else 'Unknown'}\n\n"
+            details_text += f"🎬 Director: {movie['directors']}\n\n"
+            details_text += f"👥 Cast: {', '.join(movie['cast']) if movie['cast'] else 'Unknown'}\n\n"
+            details_text += f"👥 Characters: {', '.join(movie['chars']) if movie['chars'] else 'Unknown'}\n\n"
+            details_text += f"🔗 IMDb URL: {movie['url'].split('?')[0]}\n\n"
+            details_text += f"📝 Storyline:\n{movie['storyline']}\n\n"
 
             self._update_details_text(details_text)
             self.set_status(f"Loaded details for '{movie_data['title']}'")
@@ -451,7 +353,7 @@ class MovieApp:
             self.set_status("Generating image...")
             characters_description = f"{num_characters} characters from the movie {selected_movie['title']}"
 
-            image_bytes = self.generator.generate_movie_image(
+            artifact = self.generator.generate_movie_image(
                 selected_movie['title'],
                 scene_description,
                 location,
@@ -459,8 +361,8 @@ class MovieApp:
                 style
             )
 
-            if image_bytes:
-                self._display_image(image_bytes)
+            if artifact:
+                self._display_image(artifact)
                 self.set_status("Content generation complete")
             else:
                 self.set_status("Image generation failed")
@@ -480,11 +382,11 @@ class MovieApp:
         self.dialogue_text.config(state=tk.DISABLED)
         save_dialogue_to_file(dialogue)
 
-    def _display_image(self, image_bytes):
+    def _display_image(self, artifact):
         """Display the generated image"""
-        if image_bytes:
+        if artifact:
             try:
-                image = Image.open(io.BytesIO(image_bytes))
+                image = artifact.image
 
                 max_width = 800
                 max_height = 600
@@ -500,7 +402,7 @@ class MovieApp:
                 self.image_label.config(image=photo)
                 self.image_label.image = photo  # Keep a reference!
 
-                save_image_to_file(image_bytes)
+                save_image_to_file(artifact)
 
                 self.notebook.select(2)
             except Exception as e:
@@ -1,9 +1,18 @@
 ﻿import os
 import requests
 from bs4 import BeautifulSoup
-import io
+from functools import lru_cache
 from PIL import Image, ImageDraw
-from config import SAVE_DIRECTORY, DIALOGUE_FILENAME, IMAGE_FILENAME
+from artifacts import ImageArtifact, FORMAT_EXTENSIONS, normalize_format, encode_image
+from config import (
+    SAVE_DIRECTORY,
+    DIALOGUE_FILENAME,
+    IMAGE_FILENAME,
+    IMAGE_SAVE_FORMAT,
+    IMAGE_SAVE_QUALITY,
+    THUMBNAIL_SIZE,
+    THUMBNAIL_SUFFIX
+)
 
 def get_headers():
     """Return headers for web requests to avoid being blocked"""
@@ -27,45 +36,66 @@ def save_dialogue_to_file(dialogue):
         print(f"Failed to save dialogue: {e}")
         return False
 
-def save_image_to_file(image_bytes):
-    """Save generated image to a file"""
+def save_image_to_file(artifact):
+    """Save a generated image artifact, and its thumbnail, in the configured format"""
     try:
         if not os.path.exists(SAVE_DIRECTORY):
             os.makedirs(SAVE_DIRECTORY)
 
-        filename = os.path.join(SAVE_DIRECTORY, IMAGE_FILENAME)
+        image_format = normalize_format(IMAGE_SAVE_FORMAT) if IMAGE_SAVE_FORMAT else artifact.format
+        extension = FORMAT_EXTENSIONS.get(image_format, f".{image_format.lower()}")
+
+        filename = os.path.join(SAVE_DIRECTORY, IMAGE_FILENAME + extension)
         with open(filename, "wb") as file:
-            file.write(image_bytes)
+            file.write(artifact.encode(image_format, IMAGE_SAVE_QUALITY))
         print(f"Image saved to {filename}")
+
+        if THUMBNAIL_SIZE:
+            thumbnail = artifact.thumbnail(THUMBNAIL_SIZE, image_format, IMAGE_SAVE_QUALITY)
+            thumbnail_filename = os.path.join(SAVE_DIRECTORY, IMAGE_FILENAME + THUMBNAIL_SUFFIX + extension)
+            with open(thumbnail_filename, "wb") as file:
+                file.write(thumbnail.data)
         return True
     except Exception as e:
         print(f"Failed to save image: {e}")
         return False
 
 def create_error_image(error_message):
-    """Create an error image with the given message"""
-    try:
-        img = Image.new('RGB', (600, 400), color=(200, 0, 0))
-        draw = ImageDraw.Draw(img)
-        draw.text((10, 10), "Error Generating Image", fill=(255, 255, 255))
-        draw.text((10, 50), f"Error: {str(error_message)[:150]}", fill=(255, 255, 255))
+    """Create an error image with the given message.
 
-        img_byte_arr = io.BytesIO()
-        img.save(img_byte_arr, format='PNG')
-        return img_byte_arr.getvalue()
+    The artifact is memoized and shared between callers, so it must not be modified.
+    """
+    try:
+        return _render_error_image(str(error_message)[:150])
     except Exception:
         return None
 
+@lru_cache(maxsize=32)
+def _render_error_image(message):
+    """Render an error placeholder once per distinct message"""
+    img = Image.new('RGB', (600, 400), color=(200, 0, 0))
+    draw = ImageDraw.Draw(img)
+    draw.text((10, 10), "Error Generating Image", fill=(255, 255, 255))
+    draw.text((10, 50), f"Error: {message}", fill=(255, 255, 255))
+
+    return ImageArtifact(encode_image(img, "PNG"), img, "PNG")
+
 def create_fallback_image():
-    """Create a fallback image when generation fails"""
-    try:
-        img = Image.new('RGB', (600, 400), color=(73, 109, 137))
-        draw = ImageDraw.Draw(img)
-        draw.text((10, 10), "Image Generation Failed", fill=(255, 255, 255))
-        draw.text((10, 50), "Please check your API settings", fill=(255, 255, 255))
+    """Create a fallback image when generation fails.
 
-        img_byte_arr = io.BytesIO()
-        img.save(img_byte_arr, format='PNG')
-        return img_byte_arr.getvalue()
+    The artifact is memoized and shared between callers, so it must not be modified.
+    """
+    try:
+        return _render_fallback_image()
     except Exception:
         return None
+
+@lru_cache(maxsize=None)
+def _render_fallback_image():
+    """Render the fallback placeholder once"""
+    img = Image.new('RGB', (600, 400), color=(73, 109, 137))
+    draw = ImageDraw.Draw(img)
+    draw.text((10, 10), "Image Generation Failed", fill=(255, 255, 255))
+    draw.text((10, 50), "Please check your API settings", fill=(255, 255, 255))
+
+    return ImageArtifact(encode_image(img, "PNG"), img, "PNG")